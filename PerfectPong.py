@@ -14,12 +14,51 @@ This game implements a Pong game with the following improvements:
     - Pause functionality (press P to pause/resume) and Quit (press Q).
 """
 
-import pygame
+import functools
+import importlib.util
+import inspect
 import json
 import logging
+import os
+import platform
+import random
 import sys
 import unittest
-from pygame.locals import *
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# On ARM (e.g. Raspberry Pi) SDL2's alpha blitter has SIMD paths that beat
+# pygame-ce's own; on x86 pygame-ce's AVX2/SSE2 blitters are faster, so leave
+# them alone there. Must be set before pygame is imported.
+if platform.machine().lower().startswith(("arm", "aarch64")):
+    os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
+
+import pygame
+from pygame.locals import (
+    KEYDOWN, QUIT, SRCALPHA, VIDEOEXPOSE, WINDOWEXPOSED, WINDOWFOCUSGAINED,
+    WINDOWRESTORED, WINDOWSHOWN,
+    K_1, K_2, K_3, K_4, K_DOWN, K_ESCAPE, K_LEFT, K_RIGHT, K_UP, K_a, K_d, K_p, K_q
+)
+
+# Optional numeric stack used by BallPool; the core game runs without it.
+# numpy (and numba, if present) are imported by _ball_kernel on first use,
+# so launching the game does not pay for them.
+np: Any = None
+
+# Prefer orjson for reading/writing the config file; fall back to the stdlib.
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+def _json_dumps(obj):
+    return json.dumps(obj, indent=4).encode()
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = _orjson_dumps
+except ImportError:
+    _loads = json.loads  # type: ignore[assignment]
+    _dumps = _json_dumps
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -44,7 +83,7 @@ DEFAULT_CONFIG = {
 
 def update_config(default, loaded):
     """
-    Recursively update the loaded configuration with any keys missing from the default.
+    Update the loaded configuration, at every nesting level, with any keys missing from the default.
     
     Args:
         default (dict): Default configuration.
@@ -53,112 +92,273 @@ def update_config(default, loaded):
     Returns:
         dict: Merged configuration.
     """
-    for key, value in default.items():
-        if key not in loaded:
-            loaded[key] = value
-        elif isinstance(value, dict) and isinstance(loaded.get(key), dict):
-            loaded[key] = update_config(value, loaded.get(key))
+    # Walk nested dicts with an explicit stack rather than recursion.
+    stack = [(default, loaded)]
+    while stack:
+        default_level, loaded_level = stack.pop()
+        for key, value in default_level.items():
+            if key not in loaded_level:
+                loaded_level[key] = value
+            elif isinstance(value, dict) and isinstance(loaded_level[key], dict):
+                stack.append((value, loaded_level[key]))
     return loaded
 
+# Parsed configuration together with the file modification time it was read at.
+_CONFIG_CACHE: Dict[str, Any] = {}
+
+def clear_config_cache():
+    """Discard the cached configuration so the next load_config() re-reads the file."""
+    _CONFIG_CACHE.clear()
+
 def load_config():
-    """Load the game configuration from file; merge with default if missing keys."""
+    """
+    Load the game configuration from file; merge with default if missing keys.
+
+    The parsed result is cached and reused for as long as the file's
+    modification time is unchanged.
+    """
     try:
-        with open(CONFIG_FILE, "r") as f:
-            loaded_config = json.load(f)
+        mtime = os.path.getmtime(CONFIG_FILE)
+        if _CONFIG_CACHE.get("mtime") == mtime:
+            return _CONFIG_CACHE["cfg"]
+        with open(CONFIG_FILE, "rb") as f:
+            loaded_config = _loads(f.read())
             merged_config = update_config(DEFAULT_CONFIG, loaded_config)
             logging.info("Configuration loaded successfully.")
+            _CONFIG_CACHE["mtime"] = mtime
+            _CONFIG_CACHE["cfg"] = merged_config
             return merged_config
     except FileNotFoundError:
         logging.warning("Configuration file not found; creating default config.")
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(DEFAULT_CONFIG, f, indent=4)
+        save_config(DEFAULT_CONFIG)
         return DEFAULT_CONFIG
     except Exception as e:
         logging.error("Error loading configuration: %s", e)
         return DEFAULT_CONFIG
 
+def save_config(config):
+    """
+    Write the given configuration to the config file.
+
+    The data goes to a temporary file that is then renamed over the config
+    file, so a crash mid-write never leaves a truncated config behind.
+    """
+    tmp_file = CONFIG_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(_dumps(config))
+    os.replace(tmp_file, CONFIG_FILE)
+
 CONFIG = load_config()
 
+# Settings that stay fixed for the whole run, bound once so the game loop
+# doesn't pay a dict lookup for each of them every frame.
+GAME_WIDTH = CONFIG["game_width"]
+GAME_HEIGHT = CONFIG["game_height"]
+PADDLE_WIDTH = CONFIG["paddle_width"]
+PADDLE_HEIGHT = CONFIG["paddle_height"]
+BALL_RADIUS = CONFIG["ball_radius"]
+FPS = CONFIG["fps"]
+
 # Colours
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
+def physics_step_ms(fps):
+    """
+    Return the fixed physics step, in whole milliseconds, for a frame rate.
+
+    Clock.tick(fps) waits whole milliseconds (16 at 60 FPS), so a fractional
+    1000 / fps step would fall behind and skip a frame's update.
+
+    Args:
+        fps (int): Frame rate from the config; 0 or less means uncapped.
+
+    Returns:
+        int: Step length, at least 1 ms. Uncapped rendering keeps physics at
+        the default frame rate so the game does not speed up.
+    """
+    if fps <= 0:
+        fps = DEFAULT_CONFIG["fps"]
+    return max(1, 1000 // fps)
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    """
+    Return the shared default font at the given size, loading it on first use.
+
+    Args:
+        size (int): Font size in points.
+
+    Returns:
+        pygame.font.Font: Cached font object.
+    """
+    return pygame.font.Font(None, size)
+
+def quit_pygame():
+    """Shut pygame down, dropping the cached fonts that die with it."""
+    get_font.cache_clear()
+    pygame.quit()
+
+# Surface.fblits only exists in pygame-ce; upstream pygame gets the closest
+# equivalent, a blits() call that skips building the list of result rects.
+def _blits_no_return(surface, blit_list):
+    """Blit a sequence of (surface, position) pairs onto surface in one call."""
+    surface.blits(blit_list, doreturn=False)
+
+batch_blit = pygame.Surface.fblits if hasattr(pygame.Surface, "fblits") else _blits_no_return
+
+# Window events after which the whole window must be repainted: gameplay
+# frames only push the rects of moving objects to the display.
+REPAINT_EVENTS = [VIDEOEXPOSE, WINDOWEXPOSED, WINDOWRESTORED, WINDOWFOCUSGAINED, WINDOWSHOWN]
+INPUT_EVENTS = [QUIT, KEYDOWN] + REPAINT_EVENTS
+
+def allow_input_events():
+    """Only queue the events the game reacts to (QUIT, KEYDOWN and REPAINT_EVENTS)."""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(INPUT_EVENTS)
+
 # --- Model Classes ---
 
+def make_ball_sprite(radius):
+    """
+    Rasterize a ball once so drawing it becomes a plain sprite blit.
+
+    Args:
+        radius (int): Ball radius.
+
+    Returns:
+        pygame.Surface: 2 * radius square surface with a white circle.
+    """
+    sprite = pygame.Surface((2 * radius, 2 * radius), SRCALPHA)
+    pygame.draw.circle(sprite, WHITE, (radius, radius), radius)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    return sprite
+
+# This module builds as-is with mypyc (`mypyc PerfectPong.py`). Paddle and Ball
+# carry type annotations so their per-frame code compiles to native attribute
+# access and arithmetic.
+
 class Paddle:
     """
     Class representing a paddle in the game.
 
     Attributes:
-        x (float): X-coordinate of the paddle.
-        y (float): Y-coordinate of the paddle.
+        x (int): X-coordinate of the paddle.
+        y (int): Y-coordinate of the paddle.
         width (int): Paddle width.
         height (int): Paddle height.
         speed (int): Movement speed.
+        ai_speed (int): Per-frame step when AI controlled, scaled by difficulty.
         controls (tuple): Tuple with (left_key, right_key) for manual control.
+        left (int): Move-left key, or None.
+        right (int): Move-right key, or None.
         ai (bool): Whether this paddle is controlled by the AI.
+        update (callable): update(keys, ball=None), bound to the AI or manual step.
     """
-    def __init__(self, x, y, controls, ai=False):
-        self.x = x
-        self.y = y
-        self.width = CONFIG["paddle_width"]
-        self.height = CONFIG["paddle_height"]
+    __slots__ = ("x", "y", "width", "height", "speed", "controls", "left", "right",
+                 "ai", "ai_speed", "_rect", "update")
+
+    def __init__(self, x: float, y: float, controls: Tuple[Optional[int], Optional[int]],
+                 ai: bool = False) -> None:
+        self.x = int(x)
+        self.y = int(y)
+        self.width = PADDLE_WIDTH
+        self.height = PADDLE_HEIGHT
         self.speed = 10
         self.controls = controls  # Expected to be a tuple (left_key, right_key)
+        self.left, self.right = controls
         self.ai = ai
+        # Difficulty only changes in the Options menu, between games.
+        # Whole pixels, like every other position and step, so x stays an int.
+        self.ai_speed = self.speed * CONFIG["ai_difficulty"] // 10
+        # Collision rect, kept in sync with x so no Rect is built per frame.
+        self._rect = pygame.Rect(x, y, self.width, self.height)
+        # update(keys, ball=None): the AI/manual choice is made once here rather
+        # than branched on every frame.
+        self.update = self._update_ai if ai else self._update_manual
 
-    def draw(self, screen):
-        """Draw the paddle on the given screen."""
-        pygame.draw.rect(screen, WHITE, (self.x, self.y, self.width, self.height))
+    def blit_entry(self, sprite: pygame.Surface) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """
+        Return the (surface, position) pair used to blit this paddle.
 
-    def update(self, keys, ball=None):
+        Args:
+            sprite (pygame.Surface): Pre-rendered paddle surface.
+        """
+        return sprite, (self.x, self.y)
+
+    def _update_ai(self, keys: Optional[Sequence[int]], ball: Optional["Ball"] = None) -> None:
         """
-        Update paddle position.
+        Track the ball; bound as update for AI paddles.
 
         Args:
-            keys (pygame.key.get_pressed()): Current state of keyboard keys.
-            ball (Ball, optional): Ball object for AI to track.
+            keys (pygame.key.get_pressed()): Unused; may be None.
+            ball (Ball, optional): Ball object to track.
         """
-        if self.ai and ball:
-            # Enhanced AI: move proportionally to the ball's horizontal offset
-            target = ball.x - (self.width / 2)
-            diff = target - self.x
-            move = self.speed * (CONFIG["ai_difficulty"] / 10.0)
-            if diff > move:
-                self.x += move
-            elif diff < -move:
-                self.x -= move
-            else:
-                self.x = target
+        if ball is None:
+            return
+        # Enhanced AI: move proportionally to the ball's horizontal offset
+        target = ball.x - self.width // 2
+        diff = target - self.x
+        move = self.ai_speed
+        if diff > move:
+            self.x += move
+        elif diff < -move:
+            self.x -= move
         else:
-            if self.controls[0] is not None and keys[self.controls[0]] and self.x > 0:
-                self.x -= self.speed
-            if self.controls[1] is not None and keys[self.controls[1]] and self.x + self.width < CONFIG["game_width"]:
-                self.x += self.speed
+            self.x = target
+        self._rect.x = self.x
+
+    def _update_manual(self, keys: Sequence[int], ball: Optional["Ball"] = None) -> None:
+        """
+        Move from key states; bound as update for player paddles.
+
+        Args:
+            keys (pygame.key.get_pressed()): Current state of keyboard keys.
+            ball (Ball, optional): Unused.
+        """
+        # Either control may be unbound (None) in config.json.
+        if self.left is not None and keys[self.left] and self.x > 0:
+            self.x -= self.speed
+        if self.right is not None and keys[self.right] and self.x + self.width < GAME_WIDTH:
+            self.x += self.speed
+        self._rect.x = self.x
 
 class Ball:
     """
     Class representing the game ball.
 
     Attributes:
-        x (float): X-coordinate.
-        y (float): Y-coordinate.
+        x (int): X-coordinate.
+        y (int): Y-coordinate.
         radius (int): Radius of the ball.
-        velocity_x (float): Horizontal velocity.
-        velocity_y (float): Vertical velocity.
+        velocity_x (int): Horizontal velocity.
+        velocity_y (int): Vertical velocity.
     """
-    def __init__(self, x, y, radius):
-        self.x = x
-        self.y = y
+    __slots__ = ("x", "y", "radius", "velocity_x", "velocity_y",
+                 "_x_lo", "_x_hi", "_y_lo", "_y_hi", "_rect", "_sprite")
+
+    def __init__(self, x: float, y: float, radius: int) -> None:
+        # Velocities are whole pixels per frame, so positions stay integral too.
+        self.x = int(x)
+        self.y = int(y)
         self.radius = radius
         self.velocity_x = 4
         self.velocity_y = 4
+        # Centre positions at which the ball touches a wall.
+        self._x_lo = radius
+        self._x_hi = GAME_WIDTH - radius
+        self._y_lo = radius
+        self._y_hi = GAME_HEIGHT - radius
+        # Bounding rect used for paddle collisions, moved in place each update.
+        self._rect = pygame.Rect(x - radius, y - radius, 2 * radius, 2 * radius)
+        self._sprite = make_ball_sprite(radius)
 
-    def draw(self, screen):
-        """Draw the ball on the screen."""
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius)
+    def blit_entry(self) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """Return the (surface, position) pair used to blit this ball."""
+        return self._sprite, (self.x - self.radius, self.y - self.radius)
 
-    def update(self, paddles, scores):
+    def update(self, paddles: List[Paddle], scores: Dict[str, int]) -> None:
         """
         Update ball position, handle collisions, and update scores.
 
@@ -169,34 +369,162 @@ class Ball:
         self.x += self.velocity_x
         self.y += self.velocity_y
 
-        # Wall collisions
-        if self.x - self.radius < 0 or self.x + self.radius > CONFIG["game_width"]:
-            self.velocity_x *= -1
-        if self.y - self.radius < 0:
+        # Wall collisions: clamp back inside and reflect only if the clamp kicked in.
+        x = min(max(self.x, self._x_lo), self._x_hi)
+        if x != self.x:
+            self.x = x
+            self.velocity_x = -self.velocity_x
+        self._rect.topleft = (self.x - self.radius, self.y - self.radius)
+        if self.y < self._y_lo:
             scores["player2"] += 1
             logging.info("Player 2 scored. Score: %s", scores)
             self.reset()
-        elif self.y + self.radius > CONFIG["game_height"]:
+        elif self.y > self._y_hi:
             scores["player1"] += 1
             logging.info("Player 1 scored. Score: %s", scores)
             self.reset()
 
         # Paddle collisions
         for paddle in paddles:
-            if (self.y + self.radius > paddle.y and
-                self.y - self.radius < paddle.y + paddle.height and
-                paddle.x < self.x < paddle.x + paddle.width):
+            if self._rect.colliderect(paddle._rect):
                 self.velocity_y *= -1
-                logging.info("Ball collided with paddle at x=%.2f", paddle.x)
+                # Can fire every frame in a rally, so keep it out of the INFO log.
+                if logging.root.isEnabledFor(logging.DEBUG):
+                    logging.debug("Ball collided with paddle at x=%.2f", paddle.x)
 
-    def reset(self):
+    def reset(self) -> None:
         """Reset ball to the center with a randomized direction."""
-        self.x = CONFIG["game_width"] / 2
-        self.y = CONFIG["game_height"] / 2
-        self.velocity_x = 4 * (-1 if pygame.time.get_ticks() % 2 == 0 else 1)
-        self.velocity_y = 4 * (-1 if pygame.time.get_ticks() % 2 == 0 else 1)
+        self.x = GAME_WIDTH // 2
+        self.y = GAME_HEIGHT // 2
+        # One call yields an independent random sign for each axis.
+        bits = random.getrandbits(2)
+        self.velocity_x = 4 if bits & 1 else -4
+        self.velocity_y = 4 if bits & 2 else -4
+        self._rect.topleft = (self.x - self.radius, self.y - self.radius)
         logging.info("Ball reset to center.")
 
+def _step_balls(xs, ys, vxs, vys, radius, width, height, paddles):
+    """
+    Advance every ball one step, bouncing off the side walls and the paddles.
+
+    xs, ys, vxs and vys are updated in place.
+
+    Args:
+        xs (numpy.ndarray): Ball x-coordinates.
+        ys (numpy.ndarray): Ball y-coordinates.
+        vxs (numpy.ndarray): Horizontal velocities.
+        vys (numpy.ndarray): Vertical velocities.
+        radius (int): Radius shared by every ball.
+        width (int): Play-field width.
+        height (int): Play-field height.
+        paddles (numpy.ndarray): (N, 4) float32 array of paddle x, y, width, height.
+
+    Returns:
+        tuple: Boolean masks of the balls past the top and the bottom edge.
+    """
+    xs += vxs
+    ys += vys
+    clamped = np.minimum(np.maximum(xs, radius), width - radius)
+    vxs[:] = np.where(clamped != xs, -vxs, vxs)
+    xs[:] = clamped
+    for i in range(paddles.shape[0]):
+        px, py, pw, ph = paddles[i, 0], paddles[i, 1], paddles[i, 2], paddles[i, 3]
+        hit = (xs + radius > px) & (xs - radius < px + pw) & (ys + radius > py) & (ys - radius < py + ph)
+        vys[:] = np.where(hit, -vys, vys)
+    return ys < radius, ys > height - radius
+
+@functools.lru_cache(maxsize=None)
+def _ball_kernel():
+    """
+    Import numpy on first use and return _step_balls, compiled by numba if available.
+
+    Functions that are already native, as they are when this module is compiled
+    with mypyc, are left alone since numba can only compile Python code.
+
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    global np
+    import numpy
+    np = numpy
+    try:
+        import numba
+    except ImportError:
+        return _step_balls
+    if not inspect.isfunction(_step_balls):
+        return _step_balls
+    return numba.njit(cache=True)(_step_balls)
+
+class BallPool:
+    """
+    Many balls stored as NumPy arrays (one per field) for multi-ball modes.
+
+    Attributes:
+        xs (numpy.ndarray): X-coordinates.
+        ys (numpy.ndarray): Y-coordinates.
+        vxs (numpy.ndarray): Horizontal velocities.
+        vys (numpy.ndarray): Vertical velocities.
+        radius (int): Radius shared by every ball.
+    """
+    def __init__(self, count, radius):
+        try:
+            self._step = _ball_kernel()
+        except ImportError as exc:
+            raise ImportError("BallPool requires numpy") from exc
+        self.xs = np.zeros(count, dtype=np.float32)
+        self.ys = np.zeros(count, dtype=np.float32)
+        self.vxs = np.zeros(count, dtype=np.float32)
+        self.vys = np.zeros(count, dtype=np.float32)
+        self.radius = radius
+        self._sprite = make_ball_sprite(radius)
+        self._rng = np.random.default_rng()
+        # Paddles as one (N, 4) x, y, width, height array, reused across updates.
+        self._paddle_rects = np.zeros((0, 4), dtype=np.float32)
+        self.reset(np.ones(count, dtype=bool))
+
+    def blit_entries(self):
+        """Return (surface, position) pairs for every ball, ready for fblits."""
+        r = self.radius
+        return [(self._sprite, (int(x) - r, int(y) - r)) for x, y in zip(self.xs, self.ys)]
+
+    def update(self, paddles, scores):
+        """
+        Advance all balls one step and score those that left the top or bottom.
+
+        Args:
+            paddles (list of Paddle): List of paddles to check collisions with.
+            scores (dict): Dictionary containing the players' scores.
+        """
+        rects = self._paddle_rects
+        if rects.shape[0] != len(paddles):
+            rects = self._paddle_rects = np.zeros((len(paddles), 4), dtype=np.float32)
+            rects[:, 2] = [p.width for p in paddles]
+            rects[:, 3] = [p.height for p in paddles]
+        # Paddle sizes never change, so only the x/y columns are refreshed.
+        for i, paddle in enumerate(paddles):
+            rects[i, 0] = paddle.x
+            rects[i, 1] = paddle.y
+        top, bottom = self._step(self.xs, self.ys, self.vxs, self.vys,
+                                  self.radius, GAME_WIDTH, GAME_HEIGHT, rects)
+        scores["player2"] += int(top.sum())
+        scores["player1"] += int(bottom.sum())
+        out = top | bottom
+        if out.any():
+            self.reset(out)
+
+    def reset(self, mask):
+        """
+        Move the selected balls back to the center with random directions.
+
+        Args:
+            mask (numpy.ndarray): Boolean array selecting the balls to reset.
+        """
+        n = int(mask.sum())
+        self.xs[mask] = GAME_WIDTH / 2
+        self.ys[mask] = GAME_HEIGHT / 2
+        self.vxs[mask] = self._rng.choice((-4, 4), n)
+        self.vys[mask] = self._rng.choice((-4, 4), n)
+
 # --- View / Menu Classes ---
 
 class MainMenu:
@@ -205,23 +533,23 @@ class MainMenu:
     """
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 74)
-        self.font_small = pygame.font.Font(None, 36)
+        self.font_large = get_font(74)
+        self.font_small = get_font(36)
+        # Unrelated events would otherwise wake the blocking wait in wait_for_input.
+        allow_input_events()
+        # The menu never changes, so compose it into one surface up front.
+        self._menu_surf = pygame.Surface((GAME_WIDTH, GAME_HEIGHT)).convert()
+        self._menu_surf.fill(BLACK)
+        title = self.font_large.render("Perfect Pong", True, WHITE)
+        self._menu_surf.blit(title, (GAME_WIDTH // 2 - title.get_width() // 2, 80))
+        labels = ["1. Single Player", "2. Multiplayer", "3. Options", "4. Quit"]
+        for idx, label in enumerate(labels):
+            option = self.font_small.render(label, True, WHITE)
+            self._menu_surf.blit(option, (GAME_WIDTH // 2 - option.get_width() // 2, 200 + idx * 50))
 
     def display(self):
         """Display the main menu."""
-        self.screen.fill(BLACK)
-        title = self.font_large.render("Perfect Pong", True, WHITE)
-        option1 = self.font_small.render("1. Single Player", True, WHITE)
-        option2 = self.font_small.render("2. Multiplayer", True, WHITE)
-        option3 = self.font_small.render("3. Options", True, WHITE)
-        option4 = self.font_small.render("4. Quit", True, WHITE)
-
-        self.screen.blit(title, (CONFIG["game_width"] // 2 - title.get_width() // 2, 80))
-        self.screen.blit(option1, (CONFIG["game_width"] // 2 - option1.get_width() // 2, 200))
-        self.screen.blit(option2, (CONFIG["game_width"] // 2 - option2.get_width() // 2, 250))
-        self.screen.blit(option3, (CONFIG["game_width"] // 2 - option3.get_width() // 2, 300))
-        self.screen.blit(option4, (CONFIG["game_width"] // 2 - option4.get_width() // 2, 350))
+        self.screen.blit(self._menu_surf, (0, 0))
         pygame.display.flip()
 
     def wait_for_input(self):
@@ -231,21 +559,22 @@ class MainMenu:
         Returns:
             str: "single", "multi", "options", or "quit"
         """
-        clock = pygame.time.Clock()
         while True:
-            for event in pygame.event.get():
-                if event.type == QUIT:
+            # Block until something happens instead of polling an idle menu.
+            event = pygame.event.wait()
+            if event.type == QUIT:
+                return "quit"
+            if event.type in REPAINT_EVENTS:
+                self.display()
+            elif event.type == KEYDOWN:
+                if event.key == K_1:
+                    return "single"
+                elif event.key == K_2:
+                    return "multi"
+                elif event.key == K_3:
+                    return "options"
+                elif event.key == K_4 or event.key == K_q:
                     return "quit"
-                if event.type == KEYDOWN:
-                    if event.key == K_1:
-                        return "single"
-                    elif event.key == K_2:
-                        return "multi"
-                    elif event.key == K_3:
-                        return "options"
-                    elif event.key == K_4 or event.key == K_q:
-                        return "quit"
-            clock.tick(60)
 
 class OptionsMenu:
     """
@@ -253,27 +582,38 @@ class OptionsMenu:
     """
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 74)
-        self.font_small = pygame.font.Font(None, 36)
+        self.font_large = get_font(74)
+        self.font_small = get_font(36)
         self.options = {
             "AI Difficulty": CONFIG["ai_difficulty"],
             "Max Score": CONFIG["max_score"]
         }
         self.selected = 0
         self.option_keys = list(self.options.keys())
+        allow_input_events()
+        # Title and instructions never change; the option lines are re-rendered
+        # only when the selection or a value changes (tracked by _dirty).
+        title = self.font_large.render("Options", True, WHITE).convert_alpha()
+        instr = self.font_small.render("UP/DOWN: Select, LEFT/RIGHT: Adjust, ESC: Exit.", True, WHITE).convert_alpha()
+        self._static_entries = [
+            (title, (GAME_WIDTH // 2 - title.get_width() // 2, 40)),
+            (instr, (GAME_WIDTH // 2 - instr.get_width() // 2, GAME_HEIGHT - 50))
+        ]
+        self._option_entries = []
+        self._dirty = True
 
     def display(self):
         """Display the options menu."""
+        if self._dirty:
+            self._option_entries = []
+            for idx, key in enumerate(self.option_keys):
+                option_text = f"{key}: {self.options[key]}"
+                color = WHITE if idx == self.selected else (150, 150, 150)
+                option = self.font_small.render(option_text, True, color).convert_alpha()
+                self._option_entries.append((option, (GAME_WIDTH // 2 - option.get_width() // 2, 150 + idx * 50)))
+            self._dirty = False
         self.screen.fill(BLACK)
-        title = self.font_large.render("Options", True, WHITE)
-        self.screen.blit(title, (CONFIG["game_width"] // 2 - title.get_width() // 2, 40))
-        for idx, key in enumerate(self.option_keys):
-            option_text = f"{key}: {self.options[key]}"
-            color = WHITE if idx == self.selected else (150, 150, 150)
-            option = self.font_small.render(option_text, True, color)
-            self.screen.blit(option, (CONFIG["game_width"] // 2 - option.get_width() // 2, 150 + idx * 50))
-        instr = self.font_small.render("UP/DOWN: Select, LEFT/RIGHT: Adjust, ESC: Exit.", True, WHITE)
-        self.screen.blit(instr, (CONFIG["game_width"] // 2 - instr.get_width() // 2, CONFIG["game_height"] - 50))
+        batch_blit(self.screen, self._static_entries + self._option_entries)
         pygame.display.flip()
 
     def adjust(self):
@@ -284,41 +624,49 @@ class OptionsMenu:
             bool: True if options were changed, False otherwise.
         """
         changed = False
-        clock = pygame.time.Clock()
+        self.display()
         while True:
-            self.display()
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    return changed
-                if event.type == KEYDOWN:
-                    if event.key == K_ESCAPE:
+            # Nothing animates here, so sleep until input and redraw only after it.
+            event = pygame.event.wait()
+            if event.type == QUIT:
+                return changed
+            if event.type in REPAINT_EVENTS:
+                self.display()
+            elif event.type == KEYDOWN:
+                if event.key == K_ESCAPE:
+                    if changed:
                         CONFIG["ai_difficulty"] = self.options["AI Difficulty"]
                         CONFIG["max_score"] = self.options["Max Score"]
-                        with open(CONFIG_FILE, "w") as f:
-                            json.dump(CONFIG, f, indent=4)
+                        save_config(CONFIG)
                         logging.info("Options updated: %s", CONFIG)
-                        return True
-                    elif event.key == K_UP:
-                        self.selected = (self.selected - 1) % len(self.option_keys)
-                    elif event.key == K_DOWN:
-                        self.selected = (self.selected + 1) % len(self.option_keys)
-                    elif event.key == K_LEFT:
-                        key = self.option_keys[self.selected]
-                        if key == "AI Difficulty" and self.options[key] > 1:
-                            self.options[key] -= 1
-                            changed = True
-                        elif key == "Max Score" and self.options[key] > 1:
-                            self.options[key] -= 1
-                            changed = True
-                    elif event.key == K_RIGHT:
-                        key = self.option_keys[self.selected]
-                        if key == "AI Difficulty" and self.options[key] < 10:
-                            self.options[key] += 1
-                            changed = True
-                        elif key == "Max Score" and self.options[key] < 20:
-                            self.options[key] += 1
-                            changed = True
-            clock.tick(60)
+                    return changed
+                elif event.key == K_UP:
+                    self.selected = (self.selected - 1) % len(self.option_keys)
+                    self._dirty = True
+                elif event.key == K_DOWN:
+                    self.selected = (self.selected + 1) % len(self.option_keys)
+                    self._dirty = True
+                elif event.key == K_LEFT:
+                    key = self.option_keys[self.selected]
+                    if key == "AI Difficulty" and self.options[key] > 1:
+                        self.options[key] -= 1
+                        changed = True
+                        self._dirty = True
+                    elif key == "Max Score" and self.options[key] > 1:
+                        self.options[key] -= 1
+                        changed = True
+                        self._dirty = True
+                elif event.key == K_RIGHT:
+                    key = self.option_keys[self.selected]
+                    if key == "AI Difficulty" and self.options[key] < 10:
+                        self.options[key] += 1
+                        changed = True
+                        self._dirty = True
+                    elif key == "Max Score" and self.options[key] < 20:
+                        self.options[key] += 1
+                        changed = True
+                        self._dirty = True
+                self.display()
 
 # --- Controller / Game Class ---
 
@@ -326,6 +674,11 @@ class PongGame:
     """
     Main game class that handles game state, updates, and rendering.
     """
+    # Upper bound on physics steps run in one frame after a stall.
+    MAX_CATCH_UP_STEPS = 5
+    # Fixed physics step in ms; see physics_step_ms.
+    STEP_MS = physics_step_ms(FPS)
+
     def __init__(self, mode):
         """
         Initialize the Pong game.
@@ -334,13 +687,25 @@ class PongGame:
             mode (str): Game mode ("single" or "multi").
         """
         pygame.init()
-        self.screen = pygame.display.set_mode((CONFIG["game_width"], CONFIG["game_height"]))
+        self.screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
         pygame.display.set_caption("Perfect Pong Game")
+        allow_input_events()
         self.clock = pygame.time.Clock()
         self.running = True
         self.paused = False
+        # Bound per pause state so the loop never branches on self.paused.
+        self._tick = self._tick_running
         self.scores = {"player1": 0, "player2": 0}
         self.mode = mode
+        self.max_score = CONFIG["max_score"]
+        self.font = get_font(36)
+        self.big_font = get_font(74)
+        self._score_cache = {}
+        self._pause_entry = None
+        self._prev_rects = None
+        # Pre-render the paddle sprite once so each frame is a single batched blit.
+        self._paddle_surf = pygame.Surface((PADDLE_WIDTH, PADDLE_HEIGHT)).convert()
+        self._paddle_surf.fill(WHITE)
         self.init_game()
 
     def init_game(self):
@@ -348,125 +713,300 @@ class PongGame:
         if self.mode == "single":
             # Single player: bottom paddle is manual; top paddle is AI.
             self.paddles = [
-                Paddle(CONFIG["game_width"] / 2 - CONFIG["paddle_width"] / 2,
-                       CONFIG["game_height"] - 40, (K_LEFT, K_RIGHT), ai=False),
-                Paddle(CONFIG["game_width"] / 2 - CONFIG["paddle_width"] / 2,
+                Paddle(GAME_WIDTH // 2 - PADDLE_WIDTH // 2,
+                       GAME_HEIGHT - 40, (K_LEFT, K_RIGHT), ai=False),
+                Paddle(GAME_WIDTH // 2 - PADDLE_WIDTH // 2,
                        20, (None, None), ai=True)
             ]
         elif self.mode == "multi":
             # Multiplayer: two human-controlled paddles
             self.paddles = [
-                Paddle(CONFIG["game_width"] / 4 - CONFIG["paddle_width"] / 2,
-                       CONFIG["game_height"] - 40, (CONFIG["controls"]["player1"]["left"],
-                                                    CONFIG["controls"]["player1"]["right"])),
-                Paddle(3 * CONFIG["game_width"] / 4 - CONFIG["paddle_width"] / 2,
+                Paddle(GAME_WIDTH // 4 - PADDLE_WIDTH // 2,
+                       GAME_HEIGHT - 40, (CONFIG["controls"]["player1"]["left"],
+                                          CONFIG["controls"]["player1"]["right"])),
+                Paddle(3 * GAME_WIDTH // 4 - PADDLE_WIDTH // 2,
                        20, (CONFIG["controls"]["player2"]["left"],
                             CONFIG["controls"]["player2"]["right"]))
             ]
-        self.ball = Ball(CONFIG["game_width"] / 2, CONFIG["game_height"] / 2, CONFIG["ball_radius"])
+        self.ball = Ball(GAME_WIDTH // 2, GAME_HEIGHT // 2, BALL_RADIUS)
+        self._any_manual = any(not paddle.ai for paddle in self.paddles)
 
     def run(self):
-        """Main game loop."""
+        """
+        Main game loop.
+
+        Physics advances in fixed steps of STEP_MS, so a slow frame is
+        made up for with extra steps instead of slowing the game down.
+        """
+        step_ms = self.STEP_MS
+        accumulator = step_ms
         while self.running:
             self.handle_events()
-            if not self.paused:
-                self.update()
+            accumulator = self._tick(accumulator, step_ms)
             self.draw()
-            self.clock.tick(CONFIG["fps"])
+            accumulator += self.clock.tick(FPS)
             # Check win condition
-            if self.scores["player1"] >= CONFIG["max_score"] or self.scores["player2"] >= CONFIG["max_score"]:
+            if self.scores["player1"] >= self.max_score or self.scores["player2"] >= self.max_score:
                 self.display_winner()
                 self.running = False
 
+    def _tick_running(self, accumulator, step_ms):
+        """Run the physics steps due and return the leftover time in ms."""
+        accumulator = min(accumulator, step_ms * self.MAX_CATCH_UP_STEPS)
+        while accumulator >= step_ms:
+            self.update()
+            accumulator -= step_ms
+        return accumulator
+
+    def _tick_paused(self, accumulator, step_ms):
+        """Hold the physics still; time spent paused is discarded."""
+        return 0
+
     def handle_events(self):
         """Handle game events such as key presses and quit events."""
-        for event in pygame.event.get():
+        for event in pygame.event.get(INPUT_EVENTS):
             if event.type == QUIT:
                 self.running = False
+            elif event.type in REPAINT_EVENTS:
+                # The next draw() takes the full-repaint path.
+                self._prev_rects = None
             elif event.type == KEYDOWN:
                 if event.key == K_q:
                     self.running = False
                 elif event.key == K_p:
                     self.paused = not self.paused
+                    self._tick = self._tick_paused if self.paused else self._tick_running
                     logging.info("Game paused: %s", self.paused)
 
     def update(self):
         """Update game objects."""
-        keys = pygame.key.get_pressed()
+        # Every mode currently has a human paddle, but an all-AI game needs no key state.
+        keys = pygame.key.get_pressed() if self._any_manual else None
+        ball = self.ball
         for paddle in self.paddles:
-            paddle.update(keys, self.ball)
+            paddle.update(keys, ball)
         self.ball.update(self.paddles, self.scores)
 
     def draw(self):
-        """Draw game objects and score on the screen."""
-        self.screen.fill(BLACK)
-        for paddle in self.paddles:
-            paddle.draw(self.screen)
-        self.ball.draw(self.screen)
-        self.display_score()
+        """
+        Draw game objects and score on the screen.
+
+        Only the regions covered by last frame's objects and this frame's
+        objects are erased and pushed to the display.
+        """
+        if self._prev_rects is None:
+            # First frame: the screen still holds whatever the menu drew.
+            self.screen.fill(BLACK)
+            erase_rects = [self.screen.get_rect()]
+        else:
+            erase_rects = self._prev_rects
+            for rect in erase_rects:
+                self.screen.fill(BLACK, rect)
+        candidates = [paddle.blit_entry(self._paddle_surf) for paddle in self.paddles]
+        candidates.append(self.ball.blit_entry())
+        candidates.append(self.score_blit_entry())
         if self.paused:
-            self.display_pause()
-        pygame.display.flip()
+            candidates.append(self.pause_blit_entry())
+        # Skip anything entirely outside the clip area before entering the blitter.
+        # new_rects keeps one rect per candidate so it lines up with next frame's.
+        clip = self.screen.get_clip()
+        blit_list = []
+        new_rects = []
+        for surf, pos in candidates:
+            rect = pygame.Rect(pos, surf.get_size())
+            if clip.colliderect(rect):
+                blit_list.append((surf, pos))
+            new_rects.append(rect)
+        # One fblits call locks the screen once for every sprite and text blit.
+        batch_blit(self.screen, blit_list)
+        # An object that only moved a little needs one merged rect, not two.
+        dirty = []
+        for old, new in zip(erase_rects, new_rects):
+            if old.colliderect(new):
+                dirty.append(old.union(new))
+            else:
+                dirty += (old, new)
+        dirty += erase_rects[len(new_rects):] + new_rects[len(erase_rects):]
+        pygame.display.update(dirty)
+        self._prev_rects = new_rects
 
-    def display_score(self):
-        """Display current score on the screen."""
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Player 1: {self.scores['player1']}  Player 2: {self.scores['player2']}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
+    def score_blit_entry(self):
+        """Return the (surface, position) pair for the score, rendering each score only once."""
+        key = (self.scores["player1"], self.scores["player2"])
+        surf = self._score_cache.get(key)
+        if surf is None:
+            surf = self.font.render(f"Player 1: {key[0]}  Player 2: {key[1]}", True, WHITE).convert_alpha()
+            self._score_cache[key] = surf
+        return surf, (10, 10)
 
-    def display_pause(self):
-        """Display pause overlay."""
-        font = pygame.font.Font(None, 74)
-        pause_text = font.render("PAUSED", True, WHITE)
-        self.screen.blit(pause_text, (CONFIG["game_width"] // 2 - pause_text.get_width() // 2,
-                                      CONFIG["game_height"] // 2 - pause_text.get_height() // 2))
+    def pause_blit_entry(self):
+        """Return the (surface, position) pair for the pause overlay, rendering it on first use."""
+        if self._pause_entry is None:
+            pause_text = self.big_font.render("PAUSED", True, WHITE).convert_alpha()
+            self._pause_entry = (pause_text, (GAME_WIDTH // 2 - pause_text.get_width() // 2,
+                                              GAME_HEIGHT // 2 - pause_text.get_height() // 2))
+        return self._pause_entry
 
     def display_winner(self):
         """Display the winner screen."""
-        font = pygame.font.Font(None, 74)
-        winner = "Player 1" if self.scores["player1"] >= CONFIG["max_score"] else "Player 2"
-        winner_text = font.render(f"{winner} Wins!", True, WHITE)
+        winner = "Player 1" if self.scores["player1"] >= self.max_score else "Player 2"
+        winner_text = self.big_font.render(f"{winner} Wins!", True, WHITE)
         self.screen.fill(BLACK)
-        self.screen.blit(winner_text, (CONFIG["game_width"] // 2 - winner_text.get_width() // 2,
-                                       CONFIG["game_height"] // 2 - winner_text.get_height() // 2))
+        self.screen.blit(winner_text, (GAME_WIDTH // 2 - winner_text.get_width() // 2,
+                                       GAME_HEIGHT // 2 - winner_text.get_height() // 2))
         pygame.display.flip()
         logging.info("%s wins the game!", winner)
         pygame.time.delay(3000)
 
     def quit(self):
         """Quit the game and cleanup."""
-        pygame.quit()
+        quit_pygame()
 
 # --- Unit Testing Stub ---
 
 class TestGameComponents(unittest.TestCase):
     """Unit tests for game components."""
 
+    def test_update_config_nested(self):
+        """Test that update_config() fills in missing keys at every level."""
+        loaded = {"fps": 30, "controls": {"player1": {"left": 1}}}
+        merged = update_config(DEFAULT_CONFIG, loaded)
+        self.assertEqual(merged["fps"], 30)
+        self.assertEqual(merged["controls"]["player1"], {"left": 1, "right": K_d})
+        self.assertEqual(merged["controls"]["player2"], DEFAULT_CONFIG["controls"]["player2"])
+
+    def test_load_config_cached(self):
+        """Test that load_config() reuses the parsed file until the cache is cleared."""
+        config = load_config()
+        self.assertIs(load_config(), config)
+        clear_config_cache()
+        self.assertIsNot(load_config(), config)
+
     def test_ball_reset(self):
         """Test that ball.reset() correctly centres the ball."""
-        ball = Ball(100, 100, CONFIG["ball_radius"])
+        ball = Ball(100, 100, BALL_RADIUS)
         ball.reset()
-        self.assertEqual(ball.x, CONFIG["game_width"] / 2)
-        self.assertEqual(ball.y, CONFIG["game_height"] / 2)
+        self.assertEqual(ball.x, GAME_WIDTH // 2)
+        self.assertEqual(ball.y, GAME_HEIGHT // 2)
+
+    def test_ball_reset_direction(self):
+        """Test that ball.reset() serves in all four diagonal directions."""
+        ball = Ball(100, 100, BALL_RADIUS)
+        directions = set()
+        for _ in range(200):
+            ball.reset()
+            directions.add((ball.velocity_x, ball.velocity_y))
+        self.assertEqual(directions, {(4, 4), (4, -4), (-4, 4), (-4, -4)})
+
+    def test_ball_paddle_collision(self):
+        """Test that the ball bounces off a paddle it overlaps."""
+        paddle = Paddle(100, 300, (None, None))
+        ball = Ball(150, 300 - BALL_RADIUS - 2, BALL_RADIUS)
+        scores = {"player1": 0, "player2": 0}
+        ball.update([paddle], scores)
+        self.assertEqual(ball.velocity_y, -4)
+
+    def test_ball_wall_bounce(self):
+        """Test that the ball is kept inside the side walls and reflected."""
+        ball = Ball(GAME_WIDTH - BALL_RADIUS - 1, 300, BALL_RADIUS)
+        scores = {"player1": 0, "player2": 0}
+        ball.update([], scores)
+        self.assertEqual(ball.x, GAME_WIDTH - BALL_RADIUS)
+        self.assertEqual(ball.velocity_x, -4)
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+    def test_ball_pool_update(self):
+        """Test that BallPool keeps balls inside the side walls and bounces them off paddles."""
+        pool = BallPool(8, BALL_RADIUS)
+        pool.xs[:] = GAME_WIDTH - BALL_RADIUS - 1
+        pool.vxs[:] = 4
+        scores = {"player1": 0, "player2": 0}
+        pool.update([], scores)
+        self.assertTrue((pool.xs == GAME_WIDTH - BALL_RADIUS).all())
+        self.assertTrue((pool.vxs == -4).all())
+        self.assertEqual(len(pool.blit_entries()), 8)
+
+        paddle = Paddle(100, 300, (None, None))
+        pool.xs[:] = 150
+        pool.ys[:] = 300 - BALL_RADIUS - 2
+        pool.vys[:] = 4
+        pool.update([paddle], scores)
+        self.assertTrue((pool.vys == -4).all())
+
+    def test_fixed_step_keeps_pace_with_clock(self):
+        """Test that N frames of FPS-sized clock ticks run N physics steps."""
+        from unittest import mock
+
+        with mock.patch.dict(os.environ, {"SDL_VIDEODRIVER": "dummy"}):
+            game = PongGame("single")
+        start_y = game.ball.y
+        frames = 30
+        accumulator = game.STEP_MS
+        for _ in range(frames):
+            accumulator = game._tick_running(accumulator, game.STEP_MS)
+            # What Clock.tick(FPS) returns on an on-time frame.
+            accumulator += game.STEP_MS
+        self.assertEqual(abs(game.ball.y - start_y), frames * abs(game.ball.velocity_y))
+        quit_pygame()
+
+    def test_fonts_survive_pygame_restart(self):
+        """Test that cached fonts are rebuilt after quit_pygame() and a fresh init."""
+        pygame.init()
+        get_font(36)
+        quit_pygame()
+        pygame.init()
+        self.assertIsNotNone(get_font(36).render("0", True, WHITE))
+        quit_pygame()
+
+    def test_window_expose_forces_full_repaint(self):
+        """Test that a window expose makes the next draw repaint the whole window."""
+        from unittest import mock
+
+        with mock.patch.dict(os.environ, {"SDL_VIDEODRIVER": "dummy"}):
+            game = PongGame("single")
+        game.draw()
+        self.assertIsNotNone(game._prev_rects)
+        pygame.event.post(pygame.event.Event(WINDOWEXPOSED))
+        game.handle_events()
+        self.assertIsNone(game._prev_rects)
+        quit_pygame()
+
+    def test_physics_step_ms(self):
+        """Test that the physics step stays a positive whole number of ms for any fps."""
+        self.assertEqual(physics_step_ms(60), 16)
+        self.assertEqual(physics_step_ms(2000), 1)
+        self.assertEqual(physics_step_ms(0), physics_step_ms(DEFAULT_CONFIG["fps"]))
 
     def test_paddle_update_manual(self):
         """Test that manual paddle update changes x-coordinate correctly."""
         pygame.init()
-        paddle = Paddle(100, 100, (K_LEFT, K_RIGHT), ai=False)
-        # Create a dummy keys array
-        keys = [0] * 512
-        keys[K_RIGHT] = 1
+        paddle = Paddle(100, 100, (K_a, K_d), ai=False)
+        # Stand-in for pygame's pressed-key state; arrow key codes lie
+        # outside the 512-entry range in pygame 2, so use letter keys.
+        keys = bytearray(512)
+        keys[K_d] = 1
+        initial_x = paddle.x
+        paddle.update(keys)
+        self.assertGreater(paddle.x, initial_x)
+        quit_pygame()
+
+    def test_paddle_update_unbound_control(self):
+        """Test that a manual paddle with an unbound control still moves on the other."""
+        pygame.init()
+        paddle = Paddle(100, 100, (None, K_d), ai=False)
+        keys = bytearray(512)
+        keys[K_d] = 1
         initial_x = paddle.x
         paddle.update(keys)
         self.assertGreater(paddle.x, initial_x)
-        pygame.quit()
+        quit_pygame()
 
 # --- Main Execution ---
 
 def main():
     """Main entry point for the game."""
     pygame.init()
-    screen = pygame.display.set_mode((CONFIG["game_width"], CONFIG["game_height"]))
+    screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
     main_menu = MainMenu(screen)
     while True:
         main_menu.display()
@@ -480,15 +1020,16 @@ def main():
             game = PongGame(choice)
             game.run()
         # After a game over, return to the main menu.
-    pygame.quit()
+    quit_pygame()
     logging.info("Game exited.")
 
 if __name__ == "__main__":
-    if "--test" in sys.argv:
+    # Tests only run when explicitly requested, never on a normal launch.
+    if "--test" in sys.argv or os.environ.get("PONG_RUN_TESTS") == "1":
         unittest.main(argv=[sys.argv[0]])
     else:
         try:
             main()
         except Exception as e:
             logging.exception("An unexpected error occurred: %s", e)
-            pygame.quit()
+            quit_pygame()